@@ -3,6 +3,8 @@ import pandas as pd
 import numpy as np
 import os
 import datetime
+import warnings
+import base64
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -322,6 +324,174 @@ def get_telemetry_multi(year, race, session_type, driver_list, specific_laps=Non
         "weather": weather
     }
 
+# --- FULL RACE TELEMETRY (STREAMING) ---
+
+MAX_RACE_TELEMETRY_DRIVERS = 4
+
+def _iter_driver_laps(session, driver):
+    """Yields a driver's timed laps one at a time, in lap order."""
+    drv_laps = session.laps[session.laps['Driver'] == driver].sort_values(by='LapNumber')
+    for _, lap in drv_laps.iterlaps():
+        if pd.isna(lap['LapTime']):
+            continue
+        yield lap
+
+def _iter_resampled_laps(laps, x_new, ref_time_interp):
+    """
+    Resamples each lap onto the shared distance axis as it arrives.
+    Yields (lap, speed, throttle, delta) as float32 rows, with NaN where the
+    lap's telemetry does not cover the distance. Laps that fail to resample
+    are yielded as (lap, None, None, None) so the caller can report them.
+    """
+    for lap in laps:
+        try:
+            tel = lap.get_car_data().add_distance()
+            dist = tel['Distance'].to_numpy()
+            time_interp = np.interp(x_new, dist, tel['Time'].dt.total_seconds().to_numpy(), left=np.nan, right=np.nan)
+            speed = np.interp(x_new, dist, tel['Speed'].to_numpy(), left=np.nan, right=np.nan)
+            throttle = np.interp(x_new, dist, tel['Throttle'].to_numpy(), left=np.nan, right=np.nan)
+            del tel, dist
+        except:
+            yield lap, None, None, None
+            continue
+
+        yield (
+            lap,
+            speed.astype(np.float32),
+            throttle.astype(np.float32),
+            (time_interp - ref_time_interp).astype(np.float32)
+        )
+
+def _pack_matrix(matrix, dtype, scale, nodata):
+    """
+    Quantises a float matrix to integers in units of `scale` and packs it as
+    base64 (little-endian, row-major). NaN (no data at that distance) becomes
+    `nodata`; the client decodes with value = raw * scale.
+    """
+    dtype = np.dtype(dtype).newbyteorder('<')
+    info = np.iinfo(dtype)
+    lo = info.min + 1 if nodata == info.min else info.min
+    hi = info.max - 1 if nodata == info.max else info.max
+
+    nan_mask = np.isnan(matrix)
+    packed = np.clip(np.rint(np.where(nan_mask, 0, matrix) / scale), lo, hi).astype(dtype)
+    packed[nan_mask] = nodata
+    return {
+        "dtype": dtype.name,
+        "scale": scale,
+        "nodata": nodata,
+        "shape": list(matrix.shape),
+        "data": base64.b64encode(packed.tobytes()).decode('ascii')
+    }
+
+def _nanstd_columns(matrix, decimals):
+    """Per-distance spread across laps, ignoring laps with no data there."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        std = np.round(np.nanstd(matrix, axis=0).astype(np.float64), decimals)
+    return [None if np.isnan(v) else v for v in std.tolist()]
+
+def get_race_telemetry_matrix(year, race, session_type, driver_list, resolution=1000):
+    """
+    Builds a compact (laps x distance) matrix of speed, throttle and delta to
+    the session's fastest lap for every lap of each driver's race.
+
+    Laps are streamed through a generator pipeline, so only one lap's
+    telemetry frame exists at a time. Each driver's float32 matrices are packed
+    into quantised base64 strings (see _pack_matrix) as soon as the driver is
+    done, so what builds up across drivers is ~5 bytes per (lap, distance)
+    point as raw integers, ~7 once base64 encoded. Peak memory is dominated by
+    the session itself: FastF1 has no car-data-only load, so
+    `session.load(telemetry=True)` holds car and position data for the whole
+    session (all drivers, position data unused) and grows with race length.
+
+    `lap_numbers` is the authoritative row index of each matrix. Timed laps
+    that could not be resampled are listed in `skipped_laps`, and drivers with
+    no usable laps in `skipped_drivers`.
+    """
+    session = fastf1.get_session(year, race, session_type)
+    session.load(laps=True, telemetry=True, weather=False, messages=False)
+
+    ref_lap = session.laps.pick_fastest()
+    ref_tel = ref_lap.get_car_data().add_distance()
+    track_length = float(ref_tel['Distance'].max())
+    x_new = np.linspace(0, track_length, num=resolution)
+    ref_time_interp = np.interp(x_new, ref_tel['Distance'], ref_tel['Time'].dt.total_seconds())
+    del ref_tel
+
+    results = {}
+    skipped_drivers = []
+    for d in driver_list:
+        try:
+            max_laps = int((session.laps['Driver'] == d).sum())
+            if max_laps == 0:
+                skipped_drivers.append(d)
+                continue
+
+            speed_m = np.empty((max_laps, resolution), dtype=np.float32)
+            throttle_m = np.empty((max_laps, resolution), dtype=np.float32)
+            delta_m = np.empty((max_laps, resolution), dtype=np.float32)
+            lap_numbers = []
+            lap_times = []
+            compounds = []
+            skipped_laps = []
+
+            rows = 0
+            for lap, speed, throttle, delta in _iter_resampled_laps(_iter_driver_laps(session, d), x_new, ref_time_interp):
+                if speed is None:
+                    skipped_laps.append(int(lap['LapNumber']))
+                    continue
+
+                speed_m[rows] = speed
+                throttle_m[rows] = throttle
+                delta_m[rows] = delta
+
+                raw_compound = lap['Compound']
+                compound = str(raw_compound).upper() if raw_compound else 'UNKNOWN'
+                if compound in ['NAN', '', 'NONE']: compound = 'UNKNOWN'
+
+                lap_numbers.append(int(lap['LapNumber']))
+                lap_times.append(lap['LapTime'].total_seconds())
+                compounds.append(compound)
+                rows += 1
+
+            if rows == 0:
+                skipped_drivers.append(d)
+                continue
+
+            speed_m = speed_m[:rows]
+            throttle_m = throttle_m[:rows]
+            delta_m = delta_m[:rows]
+
+            results[d] = {
+                "lap_numbers": lap_numbers,
+                "lap_times": lap_times,
+                "compounds": compounds,
+                "skipped_laps": skipped_laps,
+                # km/h in 0.1 steps, % in 1 steps, seconds in 0.01 steps
+                "speed": _pack_matrix(speed_m, np.uint16, 0.1, 65535),
+                "throttle": _pack_matrix(throttle_m, np.uint8, 1, 255),
+                "delta": _pack_matrix(delta_m, np.int16, 0.01, -32768),
+                # Per-distance spread across laps, for consistency plots
+                "speed_std": _nanstd_columns(speed_m, 2),
+                "delta_std": _nanstd_columns(delta_m, 3)
+            }
+        except Exception as e:
+            print(f"Race Telemetry Error ({d}): {e}")
+            skipped_drivers.append(d)
+            continue
+
+    if not results:
+        raise Exception("No data found.")
+
+    return {
+        "drivers": results,
+        "skipped_drivers": skipped_drivers,
+        "distance": np.round(x_new, 1).tolist(),
+        "track_length": track_length,
+        "reference_lap": {"driver": ref_lap['Driver'], "time": ref_lap.LapTime.total_seconds()}
+    }
+
 def generate_ai_insights(multi_data, k1, k2):
     """
     Generates smart comparison insights between two drivers by identifying
@@ -14,6 +14,8 @@ from analysis import (
     get_races_for_year, 
     get_sessions_for_race,
     get_race_lap_distribution,
+    get_race_telemetry_matrix,
+    MAX_RACE_TELEMETRY_DRIVERS,
     get_season_standings,
     get_season_schedule
 )
@@ -82,6 +84,19 @@ def analyze_drivers(year: int, race: str, session: str, drivers: str, specific_l
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+@app.get("/race_telemetry")
+@cache(expire=604800)
+def race_telemetry(year: int, race: str, session: str, drivers: str, quality: str = "high"):
+    driver_list = [d.strip().upper() for d in drivers.split(',')]
+    if len(driver_list) > MAX_RACE_TELEMETRY_DRIVERS:
+        return {"status": "error", "message": f"Select at most {MAX_RACE_TELEMETRY_DRIVERS} drivers for full-race telemetry."}
+    num_points = 250 if quality == "low" else 1000
+    try:
+        data = get_race_telemetry_matrix(year, race, session, driver_list, resolution=num_points)
+        return {"status": "success", "data": data}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
 # --- NEW ROUTES FOR CHAMPIONSHIP ---
 @app.get("/standings")
 def season_standings(year: int):
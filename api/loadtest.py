@@ -0,0 +1,776 @@
+"""
+Load-test harness for the API.
+
+Replays the Dashboard click path (/years -> /races -> /sessions -> /race_laps
+-> /analyze, plus the occasional /race_telemetry) at a configurable
+concurrency against the real FastAPI app, with the FastF1-backed analysis
+functions swapped for a synthetic data source and Redis swapped for a local
+stand-in (fakeredis, or any local redis-server via --redis-url).
+
+Usage (from the api/ folder):
+    python loadtest.py run --users 50 --duration 60 --json run.json
+    python loadtest.py run --users 50 --duration 60 --compare run.json
+
+    # or serve and drive separately
+    python loadtest.py serve --port 8765
+    python loadtest.py run --target http://127.0.0.1:8765
+
+Reports p50/p95/p99 latency, throughput, cache hit ratio (from the
+X-FastAPI-Cache header) and wire size per endpoint, plus server thread-pool
+and process RSS. After the load phase each endpoint is replayed on its own
+(one request at a time, cache bypassed) under tracemalloc to get the peak
+memory a single request allocates.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import zlib
+
+import numpy as np
+import requests
+
+FAKE_RACES = [
+    "Bahrain Grand Prix", "Saudi Arabian Grand Prix", "Australian Grand Prix",
+    "Japanese Grand Prix", "Chinese Grand Prix", "Miami Grand Prix",
+    "Emilia Romagna Grand Prix", "Monaco Grand Prix", "Canadian Grand Prix",
+    "Spanish Grand Prix", "Austrian Grand Prix", "British Grand Prix",
+    "Hungarian Grand Prix", "Belgian Grand Prix", "Dutch Grand Prix",
+    "Italian Grand Prix", "Azerbaijan Grand Prix", "Singapore Grand Prix",
+    "United States Grand Prix", "Mexico City Grand Prix", "São Paulo Grand Prix",
+    "Las Vegas Grand Prix", "Qatar Grand Prix", "Abu Dhabi Grand Prix"
+]
+FAKE_SESSIONS = ["Practice 1", "Practice 2", "Practice 3", "Qualifying", "Race"]
+FAKE_DRIVERS = [
+    "VER", "NOR", "LEC", "PIA", "HAM", "RUS", "SAI", "ALO", "PER", "GAS",
+    "OCO", "HUL", "TSU", "ALB", "STR", "BOT", "ZHO", "MAG", "RIC", "SAR"
+]
+POPULAR_DRIVERS = FAKE_DRIVERS[:6]
+SESSION_WEIGHTS = {"Race": 6, "Qualifying": 3}
+COMPOUNDS = ["SOFT", "MEDIUM", "HARD"]
+
+LOADTEST_PREFIX = "/_loadtest"
+STATS_PATH = LOADTEST_PREFIX + "/stats"
+TRACE_PATH = LOADTEST_PREFIX + "/trace"
+CLICK_PATH = ["/years", "/races", "/sessions", "/race_laps", "/race_telemetry", "/analyze"]
+RACE_TELEMETRY_SHARE = 0.1
+
+# --- FAKE FASTF1 DATA SOURCE ---
+
+class FakeF1Source:
+    """
+    Stands in for the FastF1-backed helpers in analysis.py. Payloads match the
+    shape of the real ones so the rest of the app (insights, caching, JSON
+    encoding, gzip) does its normal work. `load_latency` simulates the time
+    FastF1 spends loading a session on a cache miss.
+    """
+
+    def __init__(self, load_latency=1.5, meta_latency=0.05):
+        self.load_latency = load_latency
+        self.meta_latency = meta_latency
+
+    @staticmethod
+    def _seed(*parts):
+        # Stable across processes so runs replay the same payloads
+        return zlib.crc32("|".join(str(p) for p in parts).encode())
+
+    def _sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(random.uniform(0.7, 1.3) * seconds)
+
+    def get_races_for_year(self, year):
+        self._sleep(self.meta_latency)
+        return list(FAKE_RACES)
+
+    def get_sessions_for_race(self, year, race_name):
+        self._sleep(self.meta_latency)
+        return list(FAKE_SESSIONS)
+
+    def get_race_lap_distribution(self, year, race, session_type, driver_list):
+        from analysis import calculate_degradation
+
+        self._sleep(self.load_latency)
+        lap_data = []
+        stint_data = {}
+        deg_insights = []
+        for d in driver_list:
+            rng = np.random.default_rng(self._seed(year, race, session_type, d))
+            base = 90 + rng.uniform(0, 2)
+            pit_laps = sorted(rng.choice(np.arange(12, 45), size=2, replace=False).tolist())
+            bounds = [1] + [p + 1 for p in pit_laps] + [58]
+            stints = []
+            for s in range(len(bounds) - 1):
+                compound = COMPOUNDS[(s + int(rng.integers(0, 3))) % 3]
+                stint = {'compound': compound, 'start': bounds[s], 'end': bounds[s + 1] - 1}
+                laps = []
+                for n in range(stint['start'], stint['end'] + 1):
+                    t = base + 0.05 * (n - stint['start']) + rng.normal(0, 0.25)
+                    lap_data.append({'driver': d, 'lap_number': n, 'lap_time_seconds': float(t), 'compound': compound})
+                    laps.append({'n': n, 't': float(t)})
+                stints.append(stint)
+                calculate_degradation(d, stint, laps, deg_insights)
+            stint_data[d] = stints
+
+        return {
+            "laps": lap_data,
+            "stints": stint_data,
+            "race_winner": "Fake Driver",
+            "winner_label": "RACE WINNER",
+            "weather": {"air_temp": 24.0, "track_temp": 38.5, "humidity": 52.0, "rain": False},
+            "ai_insights": deg_insights[:7]
+        }
+
+    def _fake_lap(self, seed, resolution, track_length):
+        rng = np.random.default_rng(seed)
+        dist = np.linspace(0, track_length, num=resolution)
+        speed = np.full_like(dist, 325.0)
+        for c in rng.uniform(200, track_length - 200, size=14):
+            depth = rng.uniform(80, 240)
+            width = rng.uniform(60, 160)
+            speed -= depth * np.exp(-((dist - c) / width) ** 2)
+        speed = np.clip(speed + rng.normal(0, 1.5, size=resolution), 70, 345)
+
+        step = np.diff(dist, prepend=0.0)
+        time_s = np.cumsum(step / (speed / 3.6))
+        dv = np.gradient(speed)
+        throttle = np.clip((speed - 90) / 2.3, 0, 100)
+        throttle[dv > 0] = 100
+        brake = np.where(dv < -0.4, 100.0, 0.0)
+        gear = np.clip(np.round(speed / 42), 1, 8)
+        rpm = 7000 + (speed % 42) * 110
+        long_g = np.gradient(speed / 3.6) / np.maximum(np.gradient(time_s), 1e-6) / 9.81
+        angle = 2 * np.pi * dist / track_length
+        return {
+            'distance': dist,
+            'speed': speed,
+            'throttle': throttle,
+            'brake': brake,
+            'rpm': rpm,
+            'gear': gear,
+            'long_g': long_g,
+            'time': time_s,
+            'x': 3000 * np.cos(angle),
+            'y': 2000 * np.sin(angle)
+        }
+
+    def get_telemetry_multi(self, year, race, session_type, driver_list, specific_laps=None, resolution=4000):
+        self._sleep(self.load_latency)
+        track_length = 5300.0
+        pole = self._fake_lap(self._seed(year, race, session_type, "POLE"), resolution, track_length)
+
+        targets = []
+        if specific_laps:
+            for item in specific_laps:
+                targets.append((f"{item['driver']} (L{item['lap']})", item['driver'], int(item['lap'])))
+        else:
+            for d in driver_list:
+                targets.append((d, d, 1 + self._seed(race, d) % 57))
+
+        results = {}
+        for key, d, ln in targets:
+            tel = self._fake_lap(self._seed(year, race, session_type, d, ln), resolution, track_length)
+            lap_time = float(tel['time'][-1])
+            compound = COMPOUNDS[ln % 3]
+            telemetry = {k: v.tolist() for k, v in tel.items()}
+            telemetry['delta_to_pole'] = (tel['time'] - pole['time']).tolist()
+            results[key] = {
+                "telemetry": telemetry,
+                "sectors": [lap_time * 0.31, lap_time * 0.37, lap_time * 0.32],
+                "lap_time": lap_time,
+                "lap_number": ln,
+                "tyre_info": {"compound": compound, "symbol": compound[0], "age": ln % 20}
+            }
+
+        if not results:
+            raise Exception("No data found.")
+
+        pole_time = float(pole['time'][-1])
+        return {
+            "drivers": results,
+            "session_best_sectors": [pole_time * 0.31, pole_time * 0.37, pole_time * 0.32],
+            "track_length": track_length,
+            "pole_info": {"driver": "VER", "time": pole_time},
+            "weather": {"air_temp": 24.0, "track_temp": 38.5, "humidity": 52.0, "rain": False}
+        }
+
+    def get_race_telemetry_matrix(self, year, race, session_type, driver_list, resolution=1000, race_laps=57):
+        from analysis import _pack_matrix, _nanstd_columns
+
+        self._sleep(self.load_latency)
+        track_length = 5300.0
+        ref = self._fake_lap(self._seed(year, race, session_type, "POLE"), resolution, track_length)
+
+        results = {}
+        for d in driver_list:
+            speed_m = np.empty((race_laps, resolution), dtype=np.float32)
+            throttle_m = np.empty((race_laps, resolution), dtype=np.float32)
+            delta_m = np.empty((race_laps, resolution), dtype=np.float32)
+            lap_times = []
+            for row in range(race_laps):
+                tel = self._fake_lap(self._seed(year, race, session_type, d, row + 1), resolution, track_length)
+                speed_m[row] = tel['speed']
+                throttle_m[row] = tel['throttle']
+                delta_m[row] = tel['time'] - ref['time']
+                lap_times.append(float(tel['time'][-1]))
+
+            results[d] = {
+                "lap_numbers": list(range(1, race_laps + 1)),
+                "lap_times": lap_times,
+                "compounds": [COMPOUNDS[(n // 20) % 3] for n in range(race_laps)],
+                "skipped_laps": [],
+                "speed": _pack_matrix(speed_m, np.uint16, 0.1, 65535),
+                "throttle": _pack_matrix(throttle_m, np.uint8, 1, 255),
+                "delta": _pack_matrix(delta_m, np.int16, 0.01, -32768),
+                "speed_std": _nanstd_columns(speed_m, 2),
+                "delta_std": _nanstd_columns(delta_m, 3)
+            }
+
+        if not results:
+            raise Exception("No data found.")
+
+        return {
+            "drivers": results,
+            "skipped_drivers": [],
+            "distance": np.round(ref['distance'], 1).tolist(),
+            "track_length": track_length,
+            "reference_lap": {"driver": "VER", "time": float(ref['time'][-1])}
+        }
+
+# --- SERVER SIDE ---
+
+def _read_rss_mb(pid="self"):
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except Exception:
+        return None
+
+class ServerStats:
+    """
+    Thread-pool and process RSS samples, plus per-endpoint peak allocation
+    recorded while tracemalloc is on (see TRACE_PATH).
+    """
+
+    def __init__(self):
+        self.inflight = {}
+        self.endpoints = {}
+        self.pool_total = 0
+        self.pool_peak = 0
+        self.samples = 0
+        self.saturated_samples = 0
+        self.rss_start = _read_rss_mb()
+        self.rss_peak = self.rss_start
+        self.alloc_peak_mb = {}
+
+    def enter(self, path):
+        self.inflight[path] = self.inflight.get(path, 0) + 1
+        ep = self.endpoints.setdefault(path, {"peak_inflight": 0})
+        ep["peak_inflight"] = max(ep["peak_inflight"], self.inflight[path])
+
+    def record_alloc(self, path, mb):
+        self.alloc_peak_mb.setdefault(path, []).append(mb)
+
+    def exit(self, path):
+        self.inflight[path] -= 1
+
+    def sample(self):
+        import anyio.to_thread
+
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        self.pool_total = int(limiter.total_tokens)
+        borrowed = limiter.borrowed_tokens
+        self.pool_peak = max(self.pool_peak, borrowed)
+        self.samples += 1
+        if borrowed >= self.pool_total:
+            self.saturated_samples += 1
+
+        rss = _read_rss_mb()
+        if rss is not None:
+            self.rss_peak = max(self.rss_peak or 0, rss)
+
+    def to_dict(self):
+        return {
+            "thread_pool": {
+                "total": self.pool_total,
+                "peak_borrowed": self.pool_peak,
+                "saturated_fraction": self.saturated_samples / self.samples if self.samples else 0.0
+            },
+            "rss_mb": {"start": self.rss_start, "peak": self.rss_peak, "end": _read_rss_mb()},
+            "cpu_seconds": sum(os.times()[:2]),
+            "endpoints": self.endpoints,
+            "alloc_peak_mb": self.alloc_peak_mb
+        }
+
+class InFlightMiddleware:
+    """
+    Plain ASGI middleware so the bookkeeping itself stays cheap. While
+    tracemalloc is on, the peak allocation of each request is recorded; this
+    is only meaningful when requests are sent one at a time, since tracemalloc
+    counts the whole process.
+    """
+
+    def __init__(self, app, stats):
+        self.app = app
+        self.stats = stats
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(LOADTEST_PREFIX):
+            return await self.app(scope, receive, send)
+        path = scope["path"]
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        self.stats.enter(path)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.stats.exit(path)
+            if tracing and tracemalloc.is_tracing():
+                peak = tracemalloc.get_traced_memory()[1]
+                self.stats.record_alloc(path, (peak - base) / (1024 * 1024))
+
+def build_app(source, redis_url=None):
+    """Imports the real app and points it at the fake data source and Redis stand-in."""
+    import index
+
+    if redis_url is None:
+        try:
+            from fakeredis import aioredis as fake_aioredis
+        except ImportError:
+            sys.exit("fakeredis is not installed. `pip install fakeredis` or pass --redis-url.")
+        index.aioredis.from_url = lambda url, **kw: fake_aioredis.FakeRedis(**kw)
+    else:
+        os.environ["REDIS_URL"] = redis_url
+
+    index.get_races_for_year = source.get_races_for_year
+    index.get_sessions_for_race = source.get_sessions_for_race
+    index.get_race_lap_distribution = source.get_race_lap_distribution
+    index.get_telemetry_multi = source.get_telemetry_multi
+    index.get_race_telemetry_matrix = source.get_race_telemetry_matrix
+
+    app = index.app
+    stats = ServerStats()
+    app.add_middleware(InFlightMiddleware, stats=stats)
+
+    @app.on_event("startup")
+    async def start_sampler():
+        async def loop():
+            while True:
+                stats.sample()
+                await asyncio.sleep(0.02)
+        app.state.loadtest_sampler = asyncio.create_task(loop())
+
+    @app.get(STATS_PATH)
+    async def loadtest_stats():
+        return stats.to_dict()
+
+    @app.get(TRACE_PATH)
+    async def loadtest_trace(enable: bool):
+        if enable and not tracemalloc.is_tracing():
+            stats.alloc_peak_mb = {}
+            tracemalloc.start()
+        elif not enable and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return {"tracing": tracemalloc.is_tracing()}
+
+    return app
+
+def serve(args):
+    import uvicorn
+
+    source = FakeF1Source(load_latency=args.load_latency, meta_latency=args.meta_latency)
+    app = build_app(source, redis_url=args.redis_url)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+# --- CLIENT SIDE ---
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rows = []
+
+    def add(self, endpoint, latency, ok, cache, wire_bytes, body_bytes):
+        with self.lock:
+            self.rows.append((endpoint, latency, ok, cache, wire_bytes, body_bytes))
+
+def _zipf_choice(rng, items, s):
+    weights = [1.0 / (i + 1) ** s for i in range(len(items))]
+    return rng.choices(items, weights=weights)[0]
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(pct * len(sorted_values) / 100) - 1))
+    return sorted_values[k]
+
+def _is_error(r):
+    """Returns (error, payload). The app reports failures as 200 + status: error."""
+    if r.status_code != 200:
+        return True, None
+    try:
+        data = r.json()
+    except ValueError:
+        return True, None
+    return isinstance(data, dict) and data.get("status") == "error", data
+
+def virtual_user(base_url, args, deadline, recorder, user_id):
+    """One Dashboard user clicking through year -> race -> session -> laps -> analyze."""
+    rng = random.Random(args.seed + user_id)
+    http = requests.Session()
+    if args.no_gzip:
+        http.headers["Accept-Encoding"] = "identity"
+
+    def call(endpoint, params=None):
+        """Returns the parsed payload, or None if the request failed."""
+        start = time.perf_counter()
+        try:
+            r = http.get(base_url + endpoint, params=params, timeout=args.timeout)
+            body = r.content
+            latency = time.perf_counter() - start
+            error, data = _is_error(r)
+            wire = int(r.headers.get("content-length", len(body)))
+            recorder.add(endpoint, latency, not error, r.headers.get("x-fastapi-cache"), wire, len(body))
+            return None if error else data
+        except requests.RequestException:
+            recorder.add(endpoint, time.perf_counter() - start, False, None, 0, 0)
+            return None
+
+    def think():
+        if args.think > 0:
+            time.sleep(rng.expovariate(1.0 / args.think))
+
+    def backoff():
+        # A user hitting an error waits before starting over, rather than
+        # hammering a degraded server in a tight loop
+        time.sleep(max(args.think, 0.5) * rng.uniform(1, 2))
+
+    def visit():
+        """One pass through the click path. Returns False on the first failed step."""
+        data = call("/years")
+        years = (data or {}).get("years") or []
+        if not years: return False
+        year = years[-1] if rng.random() < 0.8 else rng.choice(years)
+        think()
+
+        data = call("/races", {"year": year})
+        races = (data or {}).get("races") or []
+        if not races: return False
+        # Post-race traffic: the latest race is by far the most popular
+        race = _zipf_choice(rng, list(reversed(races)), args.zipf)
+        think()
+
+        data = call("/sessions", {"year": year, "race": race})
+        sessions = (data or {}).get("sessions") or []
+        if not sessions: return False
+        session = rng.choices(sessions, weights=[SESSION_WEIGHTS.get(s, 1) for s in sessions])[0]
+        think()
+
+        pool = POPULAR_DRIVERS if rng.random() < 0.85 else FAKE_DRIVERS
+        drivers = rng.sample(pool, 2)
+        if call("/race_laps", {"year": year, "race": race, "session": session, "drivers": ",".join(drivers)}) is None:
+            return False
+        think()
+
+        # A few users open the full-race heatmap, the heaviest endpoint
+        if rng.random() < RACE_TELEMETRY_SHARE:
+            params = {
+                "year": year, "race": race, "session": session,
+                "drivers": ",".join(drivers),
+                "quality": "high" if rng.random() < 0.8 else "low"
+            }
+            if call("/race_telemetry", params) is None:
+                return False
+            think()
+
+        for _ in range(rng.randint(1, 3)):
+            params = {
+                "year": year, "race": race, "session": session,
+                "drivers": ",".join(drivers),
+                "quality": "high" if rng.random() < 0.8 else "low"
+            }
+            if rng.random() < 0.2:
+                params["specific_laps"] = json.dumps([{"driver": d, "lap": rng.randint(1, 57)} for d in drivers])
+            if call("/analyze", params) is None:
+                return False
+            think()
+            if time.time() >= deadline: break
+        return True
+
+    while time.time() < deadline:
+        try:
+            ok = visit()
+        except Exception as e:
+            # Keep the user alive so the run still has the configured concurrency
+            print(f"User {user_id} error: {e}")
+            ok = False
+        if not ok:
+            backoff()
+
+def profile_memory(base_url, args):
+    """
+    Replays one click path per endpoint with tracemalloc on, one request at a
+    time and with the cache bypassed, so each sample is the peak memory a
+    single request of that endpoint allocates. Returns {endpoint: median MB}.
+    """
+    if args.profile_requests <= 0:
+        return {}
+    try:
+        if requests.get(base_url + TRACE_PATH, params={"enable": "true"}, timeout=5).status_code != 200:
+            return {}
+    except requests.RequestException:
+        return {}
+
+    http = requests.Session()
+    http.headers["Cache-Control"] = "no-cache"
+    if args.no_gzip:
+        http.headers["Accept-Encoding"] = "identity"
+
+    try:
+        years = http.get(base_url + "/years", timeout=args.timeout).json().get("years") or []
+        year = years[-1] if years else datetime.date.today().year
+        races = http.get(base_url + "/races", params={"year": year}, timeout=args.timeout).json().get("races") or []
+        race = races[-1] if races else FAKE_RACES[0]
+        sessions = http.get(base_url + "/sessions", params={"year": year, "race": race}, timeout=args.timeout).json().get("sessions") or []
+        session = "Race" if "Race" in sessions else (sessions[-1] if sessions else "Race")
+        drivers = ",".join(POPULAR_DRIVERS[:2])
+
+        params = {
+            "/years": None,
+            "/races": {"year": year},
+            "/sessions": {"year": year, "race": race},
+            "/race_laps": {"year": year, "race": race, "session": session, "drivers": drivers},
+            "/race_telemetry": {"year": year, "race": race, "session": session, "drivers": drivers},
+            "/analyze": {"year": year, "race": race, "session": session, "drivers": drivers}
+        }
+        for endpoint in CLICK_PATH:
+            for _ in range(args.profile_requests):
+                http.get(base_url + endpoint, params=params[endpoint], timeout=args.timeout)
+
+        samples = requests.get(base_url + STATS_PATH, timeout=5).json().get("alloc_peak_mb", {})
+    except (requests.RequestException, ValueError):
+        samples = {}
+    finally:
+        try:
+            requests.get(base_url + TRACE_PATH, params={"enable": "false"}, timeout=5)
+        except requests.RequestException:
+            pass
+
+    # Drop the setup requests above; keep the last profile_requests per endpoint
+    return {
+        endpoint: sorted(values[-args.profile_requests:])[len(values[-args.profile_requests:]) // 2]
+        for endpoint, values in samples.items() if values
+    }
+
+def summarize(recorder, elapsed):
+    by_endpoint = {}
+    for endpoint, latency, ok, cache, wire, body in recorder.rows:
+        ep = by_endpoint.setdefault(endpoint, {"lat": [], "errors": 0, "hits": 0, "misses": 0, "wire": 0, "body": 0})
+        ep["lat"].append(latency)
+        if not ok: ep["errors"] += 1
+        if cache == "HIT": ep["hits"] += 1
+        elif cache == "MISS": ep["misses"] += 1
+        ep["wire"] += wire
+        ep["body"] += body
+
+    summary = {}
+    for endpoint, ep in by_endpoint.items():
+        lat = sorted(ep["lat"])
+        n = len(lat)
+        cached = ep["hits"] + ep["misses"]
+        summary[endpoint] = {
+            "requests": n,
+            "errors": ep["errors"],
+            "rps": n / elapsed if elapsed else 0.0,
+            "p50_ms": _percentile(lat, 50) * 1000,
+            "p95_ms": _percentile(lat, 95) * 1000,
+            "p99_ms": _percentile(lat, 99) * 1000,
+            "cache_hit_ratio": ep["hits"] / cached if cached else None,
+            "avg_wire_kb": ep["wire"] / n / 1024 if n else 0.0,
+            "compression_ratio": ep["body"] / ep["wire"] if ep["wire"] else None
+        }
+    total = len(recorder.rows)
+    return {"elapsed_s": elapsed, "requests": total, "rps": total / elapsed if elapsed else 0.0, "endpoints": summary}
+
+def print_report(report, previous=None):
+    def fmt(v, spec):
+        return format(v, spec) if v is not None else "n/a"
+
+    def diff(endpoint, key):
+        if not previous: return ""
+        old = previous.get("client", {}).get("endpoints", {}).get(endpoint, {}).get(key)
+        new = report["client"]["endpoints"][endpoint].get(key)
+        if not old or new is None: return ""
+        return f" ({(new - old) / old * 100:+.0f}%)"
+
+    client = report["client"]
+    server = report.get("server") or {}
+    server_eps = server.get("endpoints", {})
+    alloc = report.get("alloc_peak_mb") or {}
+
+    print(f"\n{report['config']['users']} users, {client['elapsed_s']:.1f}s, "
+          f"{client['requests']} requests, {client['rps']:.1f} req/s")
+    header = f"{'endpoint':<16}{'reqs':>7}{'err':>5}{'req/s':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'hit %':>7}{'wire KB':>9}{'gzip x':>8}{'alloc MB':>10}{'inflight':>9}"
+    print(header)
+    print("-" * len(header))
+    for endpoint in CLICK_PATH:
+        ep = client["endpoints"].get(endpoint)
+        if not ep: continue
+        sep = server_eps.get(endpoint, {})
+        hit = ep["cache_hit_ratio"] * 100 if ep["cache_hit_ratio"] is not None else None
+        print(f"{endpoint:<16}{ep['requests']:>7}{ep['errors']:>5}{ep['rps']:>8.1f}"
+              f"{ep['p50_ms']:>10.1f}{ep['p95_ms']:>10.1f}{ep['p99_ms']:>10.1f}"
+              f"{fmt(hit, '.0f'):>7}{ep['avg_wire_kb']:>9.1f}{fmt(ep['compression_ratio'], '.1f'):>8}"
+              f"{fmt(alloc.get(endpoint), '.1f'):>10}{sep.get('peak_inflight', 0):>9}"
+              f"{diff(endpoint, 'p95_ms')}")
+
+    if server:
+        pool = server["thread_pool"]
+        rss = server["rss_mb"]
+        print(f"\nthread pool: peak {pool['peak_borrowed']}/{pool['total']} busy, "
+              f"saturated {pool['saturated_fraction'] * 100:.0f}% of samples")
+        print(f"server process RSS MB: start {fmt(rss['start'], '.0f')}, peak {fmt(rss['peak'], '.0f')}, end {fmt(rss['end'], '.0f')}; "
+              f"CPU {server['cpu_seconds']:.1f}s")
+    if alloc:
+        print("(alloc MB: median peak allocation of one request, replayed alone with the cache bypassed)")
+    if previous:
+        print("(% in brackets: p95 change vs --compare run)")
+
+def wait_until_ready(base_url, server_proc=None, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server_proc is not None and server_proc.poll() is not None:
+            sys.exit(f"Server process exited with code {server_proc.returncode} before coming up.")
+        try:
+            if requests.get(base_url + "/years", timeout=1).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    return False
+
+def run(args):
+    # Fail before the run rather than losing it to a bad path afterwards
+    previous = None
+    if args.compare:
+        try:
+            with open(args.compare) as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            sys.exit(f"Cannot read --compare report {args.compare}: {e}")
+        if not isinstance(previous, dict) or "client" not in previous:
+            sys.exit(f"--compare report {args.compare} is not a loadtest.py report.")
+
+    server_flags = {"--load-latency": args.load_latency, "--meta-latency": args.meta_latency, "--redis-url": args.redis_url}
+    server_proc = None
+    base_url = args.target
+    if base_url is None:
+        base_url = f"http://127.0.0.1:{args.port}"
+        cmd = [sys.executable, os.path.abspath(__file__), "serve", "--port", str(args.port)]
+        for flag, value in server_flags.items():
+            if value is not None:
+                cmd += [flag, str(value)]
+        server_proc = subprocess.Popen(cmd, cwd=os.path.dirname(os.path.abspath(__file__)))
+    else:
+        passed = [flag for flag, value in server_flags.items() if value is not None]
+        if passed:
+            sys.exit(f"Not used with --target: {', '.join(passed)}. Pass server options to `serve` instead.")
+    base_url = base_url.rstrip("/")
+
+    try:
+        if not wait_until_ready(base_url, server_proc):
+            sys.exit(f"Server at {base_url} did not come up.")
+
+        recorder = Recorder()
+        deadline = time.time() + args.duration
+        threads = [
+            threading.Thread(target=virtual_user, args=(base_url, args, deadline, recorder, i), daemon=True)
+            for i in range(args.users)
+        ]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+            if args.ramp > 0:
+                time.sleep(args.ramp / args.users)
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+
+        # Snapshot load-phase stats before profiling adds its own requests
+        server = None
+        try:
+            r = requests.get(base_url + STATS_PATH, timeout=5)
+            if r.status_code == 200:
+                server = r.json()
+        except requests.RequestException:
+            pass
+
+        alloc = profile_memory(base_url, args)
+
+        report = {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "config": {k: v for k, v in vars(args).items() if k != "func"},
+            "client": summarize(recorder, elapsed),
+            "server": server,
+            "alloc_peak_mb": alloc
+        }
+    finally:
+        if server_proc is not None:
+            server_proc.terminate()
+            server_proc.wait(timeout=10)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    print_report(report, previous)
+    if args.json:
+        print(f"\nSaved report to {args.json}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the API with replayed Dashboard traffic.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_server_args(p, load_latency=None, meta_latency=None):
+        # `run` leaves these unset so it can pass through only what was given
+        p.add_argument("--port", type=int, default=8765)
+        p.add_argument("--load-latency", type=float, default=load_latency, help="Simulated FastF1 session load time (s) on a cache miss (default 1.5)")
+        p.add_argument("--meta-latency", type=float, default=meta_latency, help="Simulated schedule lookup time (s) (default 0.05)")
+        p.add_argument("--redis-url", default=None, help="Use a local redis-server instead of fakeredis")
+
+    p_serve = sub.add_parser("serve", help="Run the app with the fake data source and Redis stand-in")
+    add_server_args(p_serve, load_latency=1.5, meta_latency=0.05)
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.set_defaults(func=serve)
+
+    p_run = sub.add_parser("run", help="Replay click-path traffic and report")
+    add_server_args(p_run)
+    p_run.add_argument("--target", default=None, help="Base URL of an already running server (skips spawning one)")
+    p_run.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    p_run.add_argument("--duration", type=float, default=60, help="Test length (s)")
+    p_run.add_argument("--ramp", type=float, default=5, help="Time (s) over which users are started")
+    p_run.add_argument("--think", type=float, default=1.0, help="Mean think time between clicks (s)")
+    p_run.add_argument("--zipf", type=float, default=1.2, help="Race popularity skew (higher = more users on the latest race)")
+    p_run.add_argument("--timeout", type=float, default=60)
+    p_run.add_argument("--no-gzip", action="store_true", help="Request identity encoding to isolate GZip cost")
+    p_run.add_argument("--seed", type=int, default=0)
+    p_run.add_argument("--profile-requests", type=int, default=3, help="Isolated requests per endpoint for the memory profile (0 to skip)")
+    p_run.add_argument("--json", default=None, help="Write the report to this file")
+    p_run.add_argument("--compare", default=None, help="Previous --json report to compare against")
+    p_run.set_defaults(func=run)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()